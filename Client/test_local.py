@@ -1,15 +1,29 @@
 import asyncio
+import aiohttp
 import httpx
 import time
 from datetime import datetime
 import random
-from requests.auth import HTTPBasicAuth
-import requests
+from hdrh.histogram import HdrHistogram
 
 BASE_URL = "http://127.0.0.1:8000"
 ADMIN_USER = "admin"
 ADMIN_PASS = "123"
 
+# Shared keep-alive session for all async requests, opened in main()
+session: aiohttp.ClientSession = None
+
+# Fixed dispatch schedules. Latency is measured from the intended send time,
+# not the actual one, so a stalled generator cannot hide slow responses
+# (coordinated omission).
+SCENARIO_1_REQUESTS = 10
+SCENARIO_1_INTERVAL = 2.0  # seconds between scheduled sends
+SCENARIO_2_REQUESTS = 30
+SCENARIO_2_INTERVAL = 0.0  # all requests due at once
+
+# Latencies are recorded in microseconds, 1us..60s, 3 significant digits
+HISTOGRAM_MAX_US = 60_000_000
+
 # Test users (will be created if they don't exist)
 test_users = [
     ("user1", "123"),
@@ -28,51 +42,50 @@ questions = [
 def check_and_create_users():
     """Check if test users exist, create if they don't"""
     print("\n🔍 Checking test users...")
-    auth = HTTPBasicAuth(ADMIN_USER, ADMIN_PASS)
-    
     try:
-        # Get existing users
-        response = requests.get(f"{BASE_URL}/admin/users", auth=auth)
-        if response.status_code != 200:
-            print("❌ Cannot connect to admin API. Is the server running?")
-            return False
-        
-        existing_users = {u['username'] for u in response.json()}
-        
-        # Create missing users
-        for username, password in test_users:
-            if username not in existing_users:
-                print(f"⚠️  User '{username}' not found. Creating...")
-                response = requests.post(
-                    f"{BASE_URL}/admin/users",
-                    json={"username": username, "password": password},
-                    auth=auth
+        # One pooled keep-alive client for all setup calls
+        with httpx.Client(base_url=BASE_URL, auth=(ADMIN_USER, ADMIN_PASS), timeout=10) as admin:
+            # Get existing users
+            response = admin.get("/admin/users")
+            if response.status_code != 200:
+                print("❌ Cannot connect to admin API. Is the server running?")
+                return False
+            
+            existing_users = {u['username'] for u in response.json()}
+            
+            # Create missing users
+            for username, password in test_users:
+                if username not in existing_users:
+                    print(f"⚠️  User '{username}' not found. Creating...")
+                    response = admin.post(
+                        "/admin/users",
+                        json={"username": username, "password": password}
+                    )
+                    if response.status_code == 200:
+                        print(f"✅ Created user: {username}")
+                    else:
+                        print(f"❌ Failed to create {username}: {response.text}")
+                        return False
+                else:
+                    print(f"✅ User '{username}' exists")
+            
+            # Verify authentication
+            print("\n🔐 Verifying authentication...")
+            for username, password in test_users:
+                response = admin.get(
+                    "/user/auth/check",
+                    auth=(username, password)
                 )
                 if response.status_code == 200:
-                    print(f"✅ Created user: {username}")
+                    print(f"✅ {username}: Auth OK")
                 else:
-                    print(f"❌ Failed to create {username}: {response.text}")
+                    print(f"❌ {username}: Auth failed")
                     return False
-            else:
-                print(f"✅ User '{username}' exists")
-        
-        # Verify authentication
-        print("\n🔐 Verifying authentication...")
-        for username, password in test_users:
-            response = requests.get(
-                f"{BASE_URL}/user/auth/check",
-                auth=(username, password)
-            )
-            if response.status_code == 200:
-                print(f"✅ {username}: Auth OK")
-            else:
-                print(f"❌ {username}: Auth failed")
-                return False
         
         print("\n✅ All users ready!\n")
         return True
         
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("❌ Cannot connect to server. Please start the server first:")
         print("   uvicorn main:app --reload --host 127.0.0.1 --port 8000")
         return False
@@ -80,89 +93,134 @@ def check_and_create_users():
         print(f"❌ Error: {e}")
         return False
 
-async def send_chat_request(user_idx, request_num):
-    """Send a single chat request"""
+def make_schedule(n, interval):
+    """Intended dispatch times for n requests, starting now"""
+    t0 = time.monotonic()
+    return [t0 + i * interval for i in range(n)]
+
+def new_latency_histogram():
+    """Fixed-memory latency histogram (microseconds)"""
+    return HdrHistogram(1, HISTOGRAM_MAX_US, 3)
+
+def record_latency(histogram, elapsed):
+    histogram.record_value(min(max(int(elapsed * 1e6), 1), HISTOGRAM_MAX_US))
+
+def print_latency_percentiles(histogram):
+    """Print p50/p95/p99 from a latency histogram"""
+    if histogram.get_total_count() == 0:
+        print("   Latency p50/p95/p99: n/a")
+        return
+    p50, p95, p99 = (histogram.get_value_at_percentile(p) / 1e6 for p in (50, 95, 99))
+    print(f"   Latency p50: {p50:.2f}s | p95: {p95:.2f}s | p99: {p99:.2f}s")
+
+def record_result(latencies, failures, success, elapsed):
+    """Record every request's latency; failed/timed-out ones also go to `failures`"""
+    record_latency(latencies, elapsed)
+    if not success:
+        record_latency(failures, elapsed)
+
+def save_histogram(histogram, name):
+    """Dump the encoded histogram for offline plotting (e.g. as a CCDF)"""
+    path = f"latency_{name}.hdr"
+    with open(path, "wb") as f:
+        f.write(histogram.encode())
+    print(f"   Histogram saved: {path}")
+
+async def send_chat_request(user_idx, request_num, scheduled_at):
+    """Send a single chat request at its scheduled time"""
     user, password = test_users[user_idx % len(test_users)]
     question = random.choice(questions)
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            start = time.time()
-            response = await client.post(
-                f"{BASE_URL}/user/chat",
-                json={"user_id": user, "message": question},
-                auth=(user, password)
-            )
-            elapsed = time.time() - start
-            
-            if response.status_code == 200:
-                print(f"✅ Request #{request_num:3d} | User: {user:8s} | Time: {elapsed:.2f}s | Status: {response.status_code}")
-                return True, elapsed
-            else:
-                print(f"❌ Request #{request_num:3d} | User: {user:8s} | Status: {response.status_code}")
-                return False, elapsed
-        except Exception as e:
-            print(f"❌ Request #{request_num:3d} | Error: {str(e)[:50]}")
-            return False, 0
+    await asyncio.sleep(max(0, scheduled_at - time.monotonic()))
+    try:
+        async with session.post(
+            f"{BASE_URL}/user/chat",
+            json={"user_id": user, "message": question},
+            auth=aiohttp.BasicAuth(user, password)
+        ) as response:
+            await response.read()
+        elapsed = time.monotonic() - scheduled_at
+        
+        if response.status == 200:
+            print(f"✅ Request #{request_num:3d} | User: {user:8s} | Time: {elapsed:.2f}s | Status: {response.status}")
+            return True, elapsed
+        else:
+            print(f"❌ Request #{request_num:3d} | User: {user:8s} | Status: {response.status}")
+            return False, elapsed
+    except Exception as e:
+        # Timeouts and errors are the tail under overload; keep their latency too
+        print(f"❌ Request #{request_num:3d} | Error: {str(e)[:50]}")
+        return False, time.monotonic() - scheduled_at
 
 async def load_test_scenario_1():
     """Scenario 1: Sequential requests (baseline)"""
     print("\n" + "="*80)
     print("SCENARIO 1: Sequential Requests (Baseline)")
     print("="*80)
-    print("Testing: 10 sequential requests, one at a time\n")
+    print(f"Testing: {SCENARIO_1_REQUESTS} sequential requests, one every {SCENARIO_1_INTERVAL:.1f}s\n")
     
-    start_time = time.time()
+    schedule = make_schedule(SCENARIO_1_REQUESTS, SCENARIO_1_INTERVAL)
+    start_time = schedule[0]
     success_count = 0
-    response_times = []
+    latencies = new_latency_histogram()
+    failures = new_latency_histogram()
     
-    for i in range(10):
-        success, elapsed = await send_chat_request(i % len(test_users), i+1)
-        if success:
-            success_count += 1
-            response_times.append(elapsed)
-        await asyncio.sleep(0.5)
+    for i in range(SCENARIO_1_REQUESTS):
+        success, elapsed = await send_chat_request(i % len(test_users), i+1, schedule[i])
+        success_count += success
+        record_result(latencies, failures, success, elapsed)
     
-    total_time = time.time() - start_time
-    avg_response = sum(response_times) / len(response_times) if response_times else 0
+    total_time = time.monotonic() - start_time
     
     print(f"\n📊 Results:")
     print(f"   Total Time: {total_time:.2f}s")
-    print(f"   Successful: {success_count}/10")
-    print(f"   Avg Response Time: {avg_response:.2f}s")
-    print(f"   Throughput: {10/total_time:.2f} req/s")
+    print(f"   Successful: {success_count}/{SCENARIO_1_REQUESTS}")
+    print_latency_percentiles(latencies)
+    if failures.get_total_count():
+        print("   Failed/timed-out requests only:")
+        print_latency_percentiles(failures)
+    print(f"   Throughput: {SCENARIO_1_REQUESTS/total_time:.2f} req/s")
+    save_histogram(latencies, "scenario1")
     
-    return success_count >= 8  # Allow 2 failures
+    return success_count >= SCENARIO_1_REQUESTS - 2  # Allow 2 failures
 
 async def load_test_scenario_2():
     """Scenario 2: Concurrent requests (stress test)"""
     print("\n" + "="*80)
     print("SCENARIO 2: Concurrent Requests (Stress Test)")
     print("="*80)
-    print("Testing: 30 concurrent requests\n")
+    print(f"Testing: {SCENARIO_2_REQUESTS} concurrent requests\n")
     
-    start_time = time.time()
+    schedule = make_schedule(SCENARIO_2_REQUESTS, SCENARIO_2_INTERVAL)
+    start_time = schedule[0]
     
     tasks = [
-        send_chat_request(i % len(test_users), i+1)
-        for i in range(30)
+        send_chat_request(i % len(test_users), i+1, schedule[i])
+        for i in range(SCENARIO_2_REQUESTS)
     ]
     
     results = await asyncio.gather(*tasks)
     
-    total_time = time.time() - start_time
-    success_count = sum(1 for success, _ in results if success)
-    response_times = [elapsed for success, elapsed in results if success]
-    avg_response = sum(response_times) / len(response_times) if response_times else 0
+    total_time = time.monotonic() - start_time
+    success_count = 0
+    latencies = new_latency_histogram()
+    failures = new_latency_histogram()
+    for success, elapsed in results:
+        success_count += success
+        record_result(latencies, failures, success, elapsed)
     
     print(f"\n📊 Results:")
     print(f"   Total Time: {total_time:.2f}s")
-    print(f"   Successful: {success_count}/30")
-    print(f"   Failed: {30 - success_count}/30")
-    print(f"   Avg Response Time: {avg_response:.2f}s")
-    print(f"   Throughput: {30/total_time:.2f} req/s")
+    print(f"   Successful: {success_count}/{SCENARIO_2_REQUESTS}")
+    print(f"   Failed: {SCENARIO_2_REQUESTS - success_count}/{SCENARIO_2_REQUESTS}")
+    print_latency_percentiles(latencies)
+    if failures.get_total_count():
+        print("   Failed/timed-out requests only:")
+        print_latency_percentiles(failures)
+    print(f"   Throughput: {SCENARIO_2_REQUESTS/total_time:.2f} req/s")
+    save_histogram(latencies, "scenario2")
     
-    return success_count >= 25  # Allow 5 failures
+    return success_count >= SCENARIO_2_REQUESTS - 5  # Allow 5 failures
 
 async def load_test_scenario_3():
     """Scenario 3: User isolation test"""
@@ -179,13 +237,12 @@ async def load_test_scenario_3():
     
     for user, password in test_users:
         message = unique_messages[user]
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{BASE_URL}/user/chat",
-                json={"user_id": user, "message": message},
-                auth=(user, password)
-            )
-            if response.status_code == 200:
+        async with session.post(
+            f"{BASE_URL}/user/chat",
+            json={"user_id": user, "message": message},
+            auth=aiohttp.BasicAuth(user, password)
+        ) as response:
+            if response.status == 200:
                 print(f"✅ {user} said: {message}")
             else:
                 print(f"❌ {user} failed to send message")
@@ -196,13 +253,12 @@ async def load_test_scenario_3():
     all_passed = True
     
     for user, password in test_users:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{BASE_URL}/user/chat/history",
-                auth=(user, password)
-            )
-            if response.status_code == 200:
-                history = response.json().get("history", [])
+        async with session.get(
+            f"{BASE_URL}/user/chat/history",
+            auth=aiohttp.BasicAuth(user, password)
+        ) as response:
+            if response.status == 200:
+                history = (await response.json()).get("history", [])
                 expected_message = unique_messages[user]
                 
                 if expected_message in str(history):
@@ -237,15 +293,27 @@ async def main():
         return
     
     # Run scenarios
+    global session
+    session = aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=30),
+        connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=30)
+    )
     results = {}
     
-    results['scenario1'] = await load_test_scenario_1()
-    await asyncio.sleep(3)
-    
-    results['scenario2'] = await load_test_scenario_2()
-    await asyncio.sleep(3)
-    
-    results['scenario3'] = await load_test_scenario_3()
+    try:
+        # The first request pays server-side cold-start costs; keep it out of the stats
+        print("\n🔥 Warm-up request (excluded from statistics)")
+        await send_chat_request(0, 0, time.monotonic())
+        
+        results['scenario1'] = await load_test_scenario_1()
+        await asyncio.sleep(3)
+        
+        results['scenario2'] = await load_test_scenario_2()
+        await asyncio.sleep(3)
+        
+        results['scenario3'] = await load_test_scenario_3()
+    finally:
+        await session.close()
     
     # Summary
     print("\n" + "="*80)
@@ -1,4 +1,5 @@
 import os
+import logging
 from fastapi import FastAPI
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
@@ -10,20 +11,26 @@ from routes.user import vectordb_manage as user_vectordb_manage
 from routes.user import user_manage as user_user_manage
 from routes.user import user_auth
 
-from utils.postgres_db import init_db
-from utils.pgvector_db import init_vectordb
+from utils.postgres_db import init_db, close_db
+from utils.pgvector_db import init_vectordb, get_pool, close_pool, warm_up
 # NEW LINE
 
 load_dotenv()
 
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 Starting FastAPI server...")
     init_db()  # PostgreSQL for user management
     init_vectordb()  # PostgreSQL for vectors
+    app.state.pool = await get_pool()  # asyncpg pool for vector queries
+    await warm_up(app.state.pool)  # embeddings client + pool connections
     print("✅ Server ready with full PostgreSQL stack!")
     yield
     print("🛑 Server shutting down...")
+    await close_pool()
+    await close_db()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -0,0 +1,60 @@
+"""baseline user management schema
+
+The users/pdfs/ingest_state tables as originally created by init_db()'s
+create_all. Tables that already exist are left alone, so databases set up
+before migrations existed can run `alembic upgrade head` directly.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("userid", sa.String(255), nullable=False),
+            sa.Column("password", sa.String(255), nullable=False),
+        )
+        op.create_index("ix_users_userid", "users", ["userid"], unique=True)
+
+    if "pdfs" not in existing:
+        op.create_table(
+            "pdfs",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("filename", sa.String(500), nullable=False),
+            sa.Column("filepath", sa.String(1000), nullable=False),
+            sa.Column("uploaded_by", sa.String(255), nullable=False),
+            sa.Column("is_public", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_pdfs_uploaded_by", "pdfs", ["uploaded_by"])
+
+    if "ingest_state" not in existing:
+        op.create_table(
+            "ingest_state",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("filename", sa.String(500), nullable=False),
+            sa.Column("ingested_by", sa.String(255), nullable=False),
+            sa.Column("is_public", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_ingest_state_ingested_by", "ingest_state", ["ingested_by"])
+
+
+def downgrade():
+    op.drop_table("ingest_state")
+    op.drop_table("pdfs")
+    op.drop_table("users")
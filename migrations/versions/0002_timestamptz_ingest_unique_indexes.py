@@ -0,0 +1,75 @@
+"""timestamptz created_at, unique ingest records, filename indexes
+
+Every step checks the current state first, so this also applies cleanly to
+databases that were already upgraded in place by the old init_db().
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def _column_type(table, column):
+    return op.get_bind().execute(sa.text(
+        "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+        "WHERE attrelid = to_regclass(:table) AND attname = :column"
+    ), {"table": table, "column": column}).scalar()
+
+
+def _created_at_to_timestamptz(table):
+    if _column_type(table, "created_at") == "timestamp without time zone":
+        # Old rows were written with datetime.utcnow()
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN created_at TYPE timestamptz "
+            f"USING created_at AT TIME ZONE 'UTC'"
+        )
+    op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET DEFAULT now()")
+    op.execute(f"UPDATE {table} SET created_at = now() WHERE created_at IS NULL")
+    op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL")
+
+
+def upgrade():
+    _created_at_to_timestamptz("pdfs")
+    _created_at_to_timestamptz("ingest_state")
+
+    op.execute("CREATE INDEX IF NOT EXISTS ix_pdfs_filename ON pdfs (filename)")
+    # Also serves plain uploaded_by lookups
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_pdfs_uploaded_by_created_at ON pdfs "
+        "(uploaded_by, created_at DESC)"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_pdfs_uploaded_by")
+
+    exists = op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_constraint WHERE conname = 'uq_ingest_filename_user'"
+    )).scalar()
+    if not exists:
+        # Keep the earliest record of each (filename, ingested_by) pair
+        op.execute(
+            "DELETE FROM ingest_state a USING ingest_state b "
+            "WHERE a.filename = b.filename AND a.ingested_by = b.ingested_by AND a.id > b.id"
+        )
+        op.create_unique_constraint("uq_ingest_filename_user", "ingest_state", ["filename", "ingested_by"])
+    # The unique constraint's index leads with filename
+    op.execute("DROP INDEX IF EXISTS ix_ingest_state_filename")
+
+
+def downgrade():
+    op.drop_constraint("uq_ingest_filename_user", "ingest_state", type_="unique")
+    op.create_index("ix_pdfs_uploaded_by", "pdfs", ["uploaded_by"])
+    op.drop_index("ix_pdfs_uploaded_by_created_at", "pdfs")
+    op.drop_index("ix_pdfs_filename", "pdfs")
+    for table in ("pdfs", "ingest_state"):
+        op.alter_column(table, "created_at", server_default=None, nullable=True)
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN created_at TYPE timestamp "
+            f"USING created_at AT TIME ZONE 'UTC'"
+        )
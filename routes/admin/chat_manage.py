@@ -2,15 +2,17 @@ import os
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import HTTPBasicCredentials
 from routes.admin.admin_auth import verify_admin_credentials
+import asyncpg
 import utils.pgvector_db as vectordb
+from utils.pgvector_db import get_conn
 from utils.logger import log_event
 
 router = APIRouter()
 
 @router.get("/admin/chat/history/{user_id}")
-def get_chat_history(user_id: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+async def get_chat_history(user_id: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials), conn: asyncpg.Connection = Depends(get_conn)):
     try:
-        history = vectordb.get_all_history(user_id)
+        history = await vectordb.get_all_history(conn, user_id)
         log_event(credentials.username, "admin_get_chat_history", f"user_id={user_id}, count={len(history)}")
         return {"user_id": user_id, "history": history}
     except Exception as e:
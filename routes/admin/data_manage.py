@@ -1,5 +1,7 @@
 import os
+import asyncio
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Body, Form
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBasicCredentials
 from typing import List
 from routes.admin.admin_auth import verify_admin_credentials
@@ -11,9 +13,13 @@ DATA_DIR = os.path.join(PERSIST_DIR, "data")
 
 router = APIRouter()
 
+def _save_upload(file_path: str, content: bytes):
+    with open(file_path, "wb") as f:
+        f.write(content)
+
 # upload pdfs list by admin
 @router.post("/admin/pdf/upload")
-def upload_pdf(
+async def upload_pdf(
     files: List[UploadFile] = File(...),
     is_public: int = Form(0),
     credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)
@@ -32,9 +38,8 @@ def upload_pdf(
             db_path = os.path.join(uploaded_by, file.filename)
         os.makedirs(save_dir, exist_ok=True)
         file_path = os.path.join(save_dir, file.filename)
-        with open(file_path, "wb") as f:
-            f.write(file.file.read())
-        add_pdf(file.filename, uploaded_by, is_public, db_path)
+        await asyncio.to_thread(_save_upload, file_path, await file.read())
+        await add_pdf(file.filename, uploaded_by, is_public, db_path)
         uploaded.append(file.filename)
         log_event(credentials.username, "admin_upload_pdf", f"filename={file.filename}, is_public={is_public}")
     if not uploaded:
@@ -43,14 +48,14 @@ def upload_pdf(
 
 # get all pdfs uploaded by admin and users with some information like uploaded_by, is_public.
 @router.get("/admin/pdf")
-def list_pdfs(credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
-    pdfs = get_all_pdfs()
+async def list_pdfs(credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+    pdfs = await get_all_pdfs()
     log_event(credentials.username, "admin_list_pdfs", f"count={len(pdfs)}")
-    return {"pdfs": pdfs}
+    return ORJSONResponse({"pdfs": pdfs})
 
 # delete pdfs list by filename
 @router.post("/admin/pdf/delete")
-def delete_pdf(
+async def delete_pdf(
     data: dict = Body(...),
     credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)
 ):
@@ -61,7 +66,7 @@ def delete_pdf(
     errors = []
     for filename in filenames:
         from utils.postgres_db import get_all_pdfs
-        pdfs = get_all_pdfs()
+        pdfs = await get_all_pdfs()
         pdf_info = next((pdf for pdf in pdfs if pdf["filename"] == filename), None)
         if not pdf_info:
             errors.append({"filename": filename, "error": "Not found in database"})
@@ -80,7 +85,7 @@ def delete_pdf(
             continue
         from utils.postgres_db import delete_pdf_by_id
         fileid = pdf_info["id"]
-        success = delete_pdf_by_id(fileid)
+        success = await delete_pdf_by_id(fileid)
         if not success:
             errors.append({"filename": filename, "error": "Failed to delete from database"})
             continue
@@ -89,11 +94,11 @@ def delete_pdf(
     return {"deleted": deleted, "errors": errors}
 
 @router.post("/admin/pdf/delete_public")
-def delete_all_public_pdfs(credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+async def delete_all_public_pdfs(credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
     from utils.postgres_db import get_all_pdfs
     deleted = []
     errors = []
-    pdfs = get_all_pdfs()
+    pdfs = await get_all_pdfs()
     for pdf in pdfs:
         if pdf["is_public"] != 1:
             continue
@@ -107,8 +112,8 @@ def delete_all_public_pdfs(credentials: HTTPBasicCredentials = Depends(verify_ad
         except Exception as e:
             errors.append({"filename": filename, "error": str(e)})
             continue
-        from utils.postgres_db import delete_pdf_by_filename
-        success = delete_pdf_by_filename(filename)
+        from utils.postgres_db import delete_pdf_by_id
+        success = await delete_pdf_by_id(pdf["id"])
         if not success:
             errors.append({"filename": filename, "error": "Failed to delete from database"})
             continue
@@ -18,13 +18,13 @@ class UserOut(BaseModel):
     username: str
 
 @router.post("/admin/users", response_model=UserOut)
-def add_user(user: UserCreate, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
-    success = db.add_user(user.username, user.password)
+async def add_user(user: UserCreate, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+    success = await db.add_user(user.username, user.password)
     if not success:
         log_event(credentials.username, "admin_add_user", f"username={user.username}, failed")
         raise HTTPException(status_code=400, detail="User already exists.")
     # Fetch the user to get the id
-    users = db.get_all_users()
+    users = await db.get_all_users()
     for u in users:
         if u['userid'] == user.username:
             log_event(credentials.username, "admin_add_user", f"username={user.username}, id={u['id']}")
@@ -33,8 +33,8 @@ def add_user(user: UserCreate, credentials: HTTPBasicCredentials = Depends(verif
     raise HTTPException(status_code=500, detail="User creation failed.")
 
 @router.delete("/admin/users/{username}")
-def delete_user(username: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
-    success = db.delete_user(username)
+async def delete_user(username: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+    success = await db.delete_user(username)
     if not success:
         log_event(credentials.username, "admin_delete_user", f"username={username}, failed")
         raise HTTPException(status_code=404, detail="User not found.")
@@ -45,8 +45,8 @@ class ResetPasswordRequest(BaseModel):
     password: str
 
 @router.post("/admin/users/{username}/reset_password")
-def reset_password(username: str, req: ResetPasswordRequest, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
-    success = db.update_user_password(username, req.password)
+async def reset_password(username: str, req: ResetPasswordRequest, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+    success = await db.update_user_password(username, req.password)
     if not success:
         log_event(credentials.username, "admin_reset_password", f"username={username}, failed")
         raise HTTPException(status_code=404, detail="User not found.")
@@ -54,7 +54,7 @@ def reset_password(username: str, req: ResetPasswordRequest, credentials: HTTPBa
     return {"detail": "Password reset successful."}
 
 @router.get("/admin/users", response_model=List[UserOut])
-def list_users(credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
-    users = db.get_all_users()
+async def list_users(credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+    users = await db.get_all_users()
     log_event(credentials.username, "admin_list_users", f"count={len(users)}")
     return [UserOut(id=u['id'], username=u['userid']) for u in users]
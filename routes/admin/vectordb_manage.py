@@ -4,15 +4,17 @@ from fastapi.security import HTTPBasicCredentials
 from typing import Optional
 from routes.admin.admin_auth import verify_admin_credentials
 import utils.ingest as ingest
+import asyncpg
 import utils.pgvector_db as vectordb
+from utils.pgvector_db import get_conn
 from utils.logger import log_event
 
 router = APIRouter()
 
 @router.post("/admin/vectordb/ingest/all")
-def ingest_all(credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+async def ingest_all(credentials: HTTPBasicCredentials = Depends(verify_admin_credentials), conn: asyncpg.Connection = Depends(get_conn)):
     try:
-        ingest.ingest_all_pdfs()
+        await ingest.ingest_all_pdfs(conn)
         log_event(credentials.username, "admin_ingest_all_pdfs", "all public PDFs ingested")
         return {"detail": "All public PDFs ingested."}
     except Exception as e:
@@ -20,9 +22,9 @@ def ingest_all(credentials: HTTPBasicCredentials = Depends(verify_admin_credenti
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/admin/vectordb/ingest/one/{filename}")
-def ingest_by_filename(filename: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+async def ingest_by_filename(filename: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials), conn: asyncpg.Connection = Depends(get_conn)):
     try:
-        ingest.ingest_one_pdf_admin(filename)
+        await ingest.ingest_one_pdf_admin(conn, filename)
         log_event(credentials.username, "admin_ingest_pdf", f"filename={filename}")
         return {"detail": f"PDF '{filename}' ingested."}
     except Exception as e:
@@ -30,9 +32,9 @@ def ingest_by_filename(filename: str, credentials: HTTPBasicCredentials = Depend
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/admin/vectordb/ingest/public/{filename}")
-def ingest_public_pdf(filename: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+async def ingest_public_pdf(filename: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials), conn: asyncpg.Connection = Depends(get_conn)):
     try:
-        ingest.ingest_one_pdf_public(filename)
+        await ingest.ingest_one_pdf_public(conn, filename)
         log_event(credentials.username, "admin_ingest_public_pdf", f"filename={filename}")
         return {"detail": f"PDF '{filename}' ingested as public."}
     except Exception as e:
@@ -40,9 +42,9 @@ def ingest_public_pdf(filename: str, credentials: HTTPBasicCredentials = Depends
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/admin/vectordb/ingest/private/{filename}")
-def ingest_private_pdf(filename: str, user_id: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+async def ingest_private_pdf(filename: str, user_id: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials), conn: asyncpg.Connection = Depends(get_conn)):
     try:
-        ingest.ingest_one_pdf_private(filename, user_id)
+        await ingest.ingest_one_pdf_private(conn, filename, user_id)
         log_event(credentials.username, "admin_ingest_private_pdf", f"filename={filename}, user_id={user_id}")
         return {"detail": f"PDF '{filename}' ingested for user '{user_id}'."}
     except Exception as e:
@@ -50,9 +52,9 @@ def ingest_private_pdf(filename: str, user_id: str, credentials: HTTPBasicCreden
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/admin/vectordb/pdf/{filename}")
-def remove_pdf_data(filename: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+async def remove_pdf_data(filename: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials), conn: asyncpg.Connection = Depends(get_conn)):
     try:
-        vectordb.clear_pdf_by_source(filename)
+        await vectordb.clear_pdf_by_source(conn, filename)
         log_event(credentials.username, "admin_remove_pdf_data", f"filename={filename}")
         return {"detail": f"PDF data for '{filename}' removed from vectordb."}
     except Exception as e:
@@ -60,9 +62,9 @@ def remove_pdf_data(filename: str, credentials: HTTPBasicCredentials = Depends(v
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/admin/vectordb/pdf/user/{owner}")
-def remove_pdf_data_by_user(owner: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+async def remove_pdf_data_by_user(owner: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials), conn: asyncpg.Connection = Depends(get_conn)):
     try:
-        vectordb.clear_pdf_by_user(owner)
+        await vectordb.clear_pdf_by_user(conn, owner)
         log_event(credentials.username, "admin_remove_pdf_data_by_user", f"owner={owner}")
         return {"detail": f"All PDF data for user '{owner}' removed from vectordb."}
     except Exception as e:
@@ -70,9 +72,9 @@ def remove_pdf_data_by_user(owner: str, credentials: HTTPBasicCredentials = Depe
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/admin/vectordb/pdf")
-def get_available_pdf_data(credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+async def get_available_pdf_data(credentials: HTTPBasicCredentials = Depends(verify_admin_credentials), conn: asyncpg.Connection = Depends(get_conn)):
     try:
-        sources = vectordb.get_pdf_sources()
+        sources = await vectordb.get_pdf_sources(conn)
         log_event(credentials.username, "admin_list_vectordb_sources", f"count={len(sources)}")
         return {"sources": sources}
     except Exception as e:
@@ -80,9 +82,9 @@ def get_available_pdf_data(credentials: HTTPBasicCredentials = Depends(verify_ad
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/admin/vectordb/memory")
-def clear_all_users_memory(credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+async def clear_all_users_memory(credentials: HTTPBasicCredentials = Depends(verify_admin_credentials), conn: asyncpg.Connection = Depends(get_conn)):
     try:
-        vectordb.clear_history_all()
+        await vectordb.clear_history_all(conn)
         log_event(credentials.username, "admin_clear_all_users_memory", "all user chat histories cleared from vectordb")
         return {"detail": "All user chat histories cleared from vectordb."}
     except Exception as e:
@@ -90,9 +92,9 @@ def clear_all_users_memory(credentials: HTTPBasicCredentials = Depends(verify_ad
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/admin/vectordb/memory/{user_id}")
-def clear_user_memory(user_id: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials)):
+async def clear_user_memory(user_id: str, credentials: HTTPBasicCredentials = Depends(verify_admin_credentials), conn: asyncpg.Connection = Depends(get_conn)):
     try:
-        vectordb.clear_history_by_user(user_id)
+        await vectordb.clear_history_by_user(conn, user_id)
         log_event(credentials.username, "admin_clear_user_memory", f"user_id={user_id}")
         return {"detail": f"Chat history for user '{user_id}' cleared from vectordb."}
     except Exception as e:
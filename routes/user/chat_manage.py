@@ -1,10 +1,12 @@
 import os
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import HTTPBasicCredentials
 from pydantic import BaseModel
 from routes.user.user_auth import verify_user_credentials
+import asyncpg
 import utils.pgvector_db as vectordb
-from utils.pgvector_db import save_user_message, retrieve_user_memory, retrieve_pdf_for_user
+from utils.pgvector_db import get_conn, save_user_message, retrieve_user_memory, retrieve_pdf_for_user
+from utils.embeddings import batched_embedder
 from utils.llm import LLM as chatmodel
 import asyncio
 from utils.logger import log_event
@@ -16,16 +18,33 @@ class ChatRequest(BaseModel):
     message: str
 
 @router.post("/user/chat")
-async def chat(req: ChatRequest, credentials: HTTPBasicCredentials = Depends(verify_user_credentials)):
+async def chat(req: ChatRequest, request: Request, credentials: HTTPBasicCredentials = Depends(verify_user_credentials)):
     user_id = credentials.username
-    mem_docs = await asyncio.to_thread(retrieve_user_memory, user_id, req.message, 3)
-    pdf_docs = await asyncio.to_thread(retrieve_pdf_for_user, user_id, req.message, 3)
+    # Embed once and reuse it for the memory lookup, PDF lookup and history write
+    emb = await batched_embedder.embed(req.message)
+
+    pool = request.app.state.pool
+
+    # Each lookup borrows its own connection and returns it before the LLM
+    # call; no task ever waits for a connection while holding another one.
+    async def memory_then_save():
+        # Read memory before saving so the turn does not retrieve itself
+        async with pool.acquire() as conn, conn.transaction():
+            docs = await retrieve_user_memory(conn, user_id, req.message, 3, precomputed_emb=emb)
+            update_cache = await save_user_message(conn, user_id, req.message, precomputed_emb=emb)
+        # Only touch the history cache once the message is committed
+        update_cache()
+        return docs
+
+    async def pdf_lookup():
+        async with pool.acquire() as conn:
+            return await retrieve_pdf_for_user(conn, user_id, req.message, 3, precomputed_emb=emb)
+
+    mem_docs, pdf_docs = await asyncio.gather(memory_then_save(), pdf_lookup())
 
     mem_text = "\n".join([d.page_content for d in mem_docs]) if mem_docs else "No previous conversation found."
     pdf_text = "\n".join([d.page_content for d in pdf_docs]) if pdf_docs else "No relevant documents found."
 
-    await asyncio.to_thread(save_user_message, user_id, req.message)
-
     prompt = f"""
     Previous conversation:
     {mem_text}
@@ -42,7 +61,7 @@ async def chat(req: ChatRequest, credentials: HTTPBasicCredentials = Depends(ver
     return {"response": response, "prompt": prompt}
 
 @router.get("/user/chat/history")
-async def get_my_history(credentials: HTTPBasicCredentials = Depends(verify_user_credentials)):
-    history = vectordb.get_all_history(credentials.username)
+async def get_my_history(credentials: HTTPBasicCredentials = Depends(verify_user_credentials), conn: asyncpg.Connection = Depends(get_conn)):
+    history = await vectordb.get_all_history(conn, credentials.username)
     log_event(credentials.username, "user_get_chat_history", f"count={len(history)}")
     return {"user_id": credentials.username, "history": history}
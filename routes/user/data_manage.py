@@ -1,5 +1,7 @@
 import os
+import asyncio
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, Body, Form
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBasicCredentials
 from typing import List
 from routes.user.user_auth import verify_user_credentials
@@ -11,8 +13,12 @@ DATA_DIR = os.path.join(PERSIST_DIR, "data")
 
 router = APIRouter()
 
+def _save_upload(file_path: str, content: bytes):
+    with open(file_path, "wb") as f:
+        f.write(content)
+
 @router.post("/user/pdf/upload")
-def upload_pdf(
+async def upload_pdf(
     files: List[UploadFile] = File(...),
     credentials: HTTPBasicCredentials = Depends(verify_user_credentials),
     is_public: int = Form(0)
@@ -29,9 +35,8 @@ def upload_pdf(
             db_path = os.path.join(credentials.username, file.filename)
         os.makedirs(save_dir, exist_ok=True)
         file_path = os.path.join(save_dir, file.filename)
-        with open(file_path, "wb") as f:
-            f.write(file.file.read())
-        db.add_pdf(file.filename, credentials.username, is_public, db_path)
+        await asyncio.to_thread(_save_upload, file_path, await file.read())
+        await db.add_pdf(file.filename, credentials.username, is_public, db_path)
         uploaded.append(file.filename)
         log_event(credentials.username, "upload_pdf", f"filename={file.filename}, is_public={is_public}")
     if not uploaded:
@@ -39,13 +44,19 @@ def upload_pdf(
     return {"uploaded": uploaded}
 
 @router.get("/user/pdf")
-def list_pdfs(credentials: HTTPBasicCredentials = Depends(verify_user_credentials)):
-    pdfs = db.get_pdfs_by_user(credentials.username)
+async def list_pdfs(credentials: HTTPBasicCredentials = Depends(verify_user_credentials)):
+    pdfs = await db.get_pdfs_by_user(credentials.username)
     log_event(credentials.username, "list_pdfs", f"count={len(pdfs)}")
-    return {"pdfs": pdfs}
+    return ORJSONResponse({"pdfs": pdfs})
+
+@router.get("/user/pdf/status")
+async def list_pdfs_with_ingest_state(credentials: HTTPBasicCredentials = Depends(verify_user_credentials)):
+    pdfs = await db.get_user_pdfs_with_ingest_state(credentials.username)
+    log_event(credentials.username, "list_pdfs_status", f"count={len(pdfs)}")
+    return ORJSONResponse({"pdfs": pdfs})
 
 @router.post("/user/pdf/delete")
-def delete_pdf(
+async def delete_pdf(
     data: dict = Body(...),
     credentials: HTTPBasicCredentials = Depends(verify_user_credentials)
 ):
@@ -55,7 +66,7 @@ def delete_pdf(
     deleted = []
     errors = []
     for filename in filenames:
-        pdfs = db.get_pdfs_by_user(credentials.username)
+        pdfs = await db.get_pdfs_by_user(credentials.username)
         pdf_info = next((pdf for pdf in pdfs if pdf["filename"] == filename), None)
         if not pdf_info:
             errors.append({"filename": filename, "error": "Not found in database"})
@@ -72,7 +83,7 @@ def delete_pdf(
         except Exception as e:
             errors.append({"filename": filename, "error": str(e)})
             continue
-        success = db.delete_pdf_by_filename(filename)
+        success = await db.delete_pdf_by_id(pdf_info["id"])
         if not success:
             errors.append({"filename": filename, "error": "Failed to delete from database"})
             continue
@@ -81,8 +92,8 @@ def delete_pdf(
     return {"deleted": deleted, "errors": errors}
 
 @router.get("/user/ingested_pdfs")
-def list_ingested_pdfs(credentials: HTTPBasicCredentials = Depends(verify_user_credentials)):
+async def list_ingested_pdfs(credentials: HTTPBasicCredentials = Depends(verify_user_credentials)):
     from utils.postgres_db import get_ingested_pdfs_by_user
-    pdfs = get_ingested_pdfs_by_user(credentials.username)
+    pdfs = await get_ingested_pdfs_by_user(credentials.username)
     log_event(credentials.username, "list_ingested_pdfs", f"count={len(pdfs)}")
-    return {"ingested_pdfs": pdfs}
+    return ORJSONResponse({"ingested_pdfs": pdfs})
@@ -7,8 +7,8 @@ from utils.logger import log_event
 security = HTTPBasic()
 router = APIRouter()
 
-def verify_user_credentials(credentials: HTTPBasicCredentials = Depends(security)):
-    if not db.authenticate_user(credentials.username, credentials.password):
+async def verify_user_credentials(credentials: HTTPBasicCredentials = Depends(security)):
+    if not await db.authenticate_user(credentials.username, credentials.password):
         log_event(credentials.username, "user_auth_check", "failed")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -11,8 +11,8 @@ class UserLogin(BaseModel):
     password: str
 
 @router.post("/user/login")
-def user_login(user: UserLogin):
-    if db.authenticate_user(user.username, user.password):
+async def user_login(user: UserLogin):
+    if await db.authenticate_user(user.username, user.password):
         log_event(user.username, "user_login", "success")
         return {"success": True, "user_id": user.username}
     else:
@@ -0,0 +1,89 @@
+import asyncio
+from typing import List, Optional, Tuple
+import httpx
+from openai import AsyncOpenAI
+from dotenv import load_dotenv
+
+load_dotenv()
+
+EMBEDDING_MODEL = "text-embedding-ada-002"
+EMBED_BATCH_SIZE = 96
+EMBED_MAX_CONCURRENCY = 8  # stay under OpenAI rate limits
+
+class AsyncOpenAIEmbeddings:
+    """Async OpenAI embeddings client sharing one pooled HTTP connection set"""
+    def __init__(self, model: str = EMBEDDING_MODEL):
+        self.model = model
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+        )
+        self.client = AsyncOpenAI(http_client=self.http_client)
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        response = await self.client.embeddings.create(input=texts, model=self.model)
+        return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
+    async def embed_query(self, text: str) -> List[float]:
+        return (await self.embed_documents([text]))[0]
+
+class BatchedEmbedder:
+    """Coalesce concurrent embed requests into a single embed_documents call.
+
+    Requests are collected for up to `max_wait` seconds or until
+    `max_batch_size` are pending, whichever comes first.
+    """
+    def __init__(self, embeddings: AsyncOpenAIEmbeddings, max_batch_size: int = 16, max_wait: float = 0.02):
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flushes = set()
+
+    async def embed(self, text: str) -> List[float]:
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    def _ensure_worker(self):
+        # The queue and worker are bound to the running loop, so (re)create
+        # them lazily the first time we are used from a new loop.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._collect())
+
+    async def _collect(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Flush in the background so the next window starts collecting immediately
+            task = self._loop.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]):
+        try:
+            vectors = await self.embeddings.embed_documents([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+embedding = AsyncOpenAIEmbeddings()
+batched_embedder = BatchedEmbedder(embedding)
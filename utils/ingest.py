@@ -1,10 +1,12 @@
 import os
+import asyncio
+import asyncpg
 from dotenv import load_dotenv
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
-from utils.postgres_db import get_all_pdfs, get_pdfs_by_user, ingest
-from utils.pgvector_db import insert_new_chunks
+from utils.postgres_db import get_all_pdfs, get_pdfs_by_user, ingest, close_db
+from utils.pgvector_db import insert_new_chunks, get_pool, close_pool
 
 load_dotenv(".env")
 
@@ -13,11 +15,17 @@ DATA_DIR = os.path.join(PERSIST_DIR, "data")
 
 splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
 
+def _load_chunks(file_path: str):
+    """Load and split a PDF (blocking, run in a worker thread)."""
+    loader = PyPDFLoader(file_path)
+    docs = loader.load()
+    return splitter.split_documents(docs)
+
 ####################################
 # Admin
 ####################################
 
-def ingest_all_pdfs():
+async def ingest_all_pdfs(conn: asyncpg.Connection):
     """Admin: Ingest all PDFs in public folder."""
     public_dir = os.path.join(DATA_DIR, "public")
     if not os.path.exists(public_dir):
@@ -30,20 +38,18 @@ def ingest_all_pdfs():
     for pdf in pdfs:
         file_path = os.path.join(public_dir, pdf)
         try:
-            loader = PyPDFLoader(file_path)
-            docs = loader.load()
-            chunks = splitter.split_documents(docs)
+            chunks = await asyncio.to_thread(_load_chunks, file_path)
             for c in chunks:
                 c.metadata = {"user_id": "public", "filename": pdf, "source": pdf, "is_public": 1}
-            insert_new_chunks(chunks)
-            ingest(pdf, "public", 1)
+            await insert_new_chunks(conn, chunks)
+            await ingest(pdf, "public", 1)
             print(f"Ingested public PDF: {pdf}")
         except Exception as e:
             print(f"Failed to ingest {pdf}: {e}")
 
-def ingest_one_pdf_admin(filename: str, user_id: str = None):
+async def ingest_one_pdf_admin(conn: asyncpg.Connection, filename: str, user_id: str = None):
     """Admin: Ingest one PDF for any user or for all (public). If user_id is None, treat as public."""
-    all_pdfs = get_all_pdfs()
+    all_pdfs = await get_all_pdfs()
     pdf_info = None
     for pdf in all_pdfs:
         if pdf["filename"] == filename:
@@ -58,9 +64,7 @@ def ingest_one_pdf_admin(filename: str, user_id: str = None):
     else:
         file_path = os.path.join(DATA_DIR, pdf_info["uploaded_by"], filename)
     try:
-        loader = PyPDFLoader(file_path)
-        docs = loader.load()
-        chunks = splitter.split_documents(docs)
+        chunks = await asyncio.to_thread(_load_chunks, file_path)
         if user_id:
             meta_user = user_id
             is_public = 0
@@ -74,15 +78,15 @@ def ingest_one_pdf_admin(filename: str, user_id: str = None):
                 "source": pdf_info["filename"],
                 "is_public": is_public
             }
-        insert_new_chunks(chunks)
-        ingest(pdf_info["filename"], meta_user, is_public)
+        await insert_new_chunks(conn, chunks)
+        await ingest(pdf_info["filename"], meta_user, is_public)
         print(f"Admin ingested PDF: {filename} for user: {meta_user}")
     except Exception as e:
         print(f"Failed to ingest {filename}: {e}")
 
-def ingest_one_pdf_public(filename: str):
+async def ingest_one_pdf_public(conn: asyncpg.Connection, filename: str):
     """Admin: Ingest one PDF as public (user_id='public', is_public=1)."""
-    all_pdfs = get_all_pdfs()
+    all_pdfs = await get_all_pdfs()
     pdf_info = None
     for pdf in all_pdfs:
         if pdf["filename"] == filename:
@@ -96,9 +100,7 @@ def ingest_one_pdf_public(filename: str):
     #     return
     file_path = os.path.join(DATA_DIR, "public", filename)
     try:
-        loader = PyPDFLoader(file_path)
-        docs = loader.load()
-        chunks = splitter.split_documents(docs)
+        chunks = await asyncio.to_thread(_load_chunks, file_path)
         for c in chunks:
             c.metadata = {
                 "user_id": "public",
@@ -106,15 +108,15 @@ def ingest_one_pdf_public(filename: str):
                 "source": pdf_info["filename"],
                 "is_public": 1
             }
-        insert_new_chunks(chunks)
-        ingest(pdf_info["filename"], "public", 1)
+        await insert_new_chunks(conn, chunks)
+        await ingest(pdf_info["filename"], "public", 1)
         print(f"Admin ingested PDF: {filename} as public.")
     except Exception as e:
         print(f"Failed to ingest {filename}: {e}")
 
-def ingest_one_pdf_private(filename: str, user_id: str):
+async def ingest_one_pdf_private(conn: asyncpg.Connection, filename: str, user_id: str):
     """Admin: Ingest one PDF for a specific user (user_id, is_public=0)."""
-    all_pdfs = get_all_pdfs()
+    all_pdfs = await get_all_pdfs()
     pdf_info = None
     print("TEST", all_pdfs)
     for pdf in all_pdfs:
@@ -130,9 +132,7 @@ def ingest_one_pdf_private(filename: str, user_id: str):
     else:
         file_path = os.path.join(DATA_DIR, pdf_info["uploaded_by"], filename)
     try:
-        loader = PyPDFLoader(file_path)
-        docs = loader.load()
-        chunks = splitter.split_documents(docs)
+        chunks = await asyncio.to_thread(_load_chunks, file_path)
         for c in chunks:
             c.metadata = {
                 "user_id": user_id,
@@ -140,8 +140,8 @@ def ingest_one_pdf_private(filename: str, user_id: str):
                 "source": pdf_info["filename"],
                 "is_public": 0
             }
-        insert_new_chunks(chunks)
-        ingest(pdf_info["filename"], user_id, 0)
+        await insert_new_chunks(conn, chunks)
+        await ingest(pdf_info["filename"], user_id, 0)
         print(f"Admin ingested PDF: {filename} for user: {user_id}.")
     except Exception as e:
         print(f"Failed to ingest {filename}: {e}")
@@ -152,12 +152,12 @@ def ingest_one_pdf_private(filename: str, user_id: str):
 # User
 ####################################
 
-def ingest_my_all_pdfs(user_id: str = None, is_public: bool = False):
+async def ingest_my_all_pdfs(conn: asyncpg.Connection, user_id: str = None, is_public: bool = False):
     """User: Ingest all PDFs uploaded by this user. Only for me."""
     if not user_id:
         print("user_id required")
         return
-    pdfs = get_pdfs_by_user(user_id)
+    pdfs = await get_pdfs_by_user(user_id)
     if not pdfs:
         print(f"No PDFs found for user {user_id}")
         return
@@ -166,23 +166,21 @@ def ingest_my_all_pdfs(user_id: str = None, is_public: bool = False):
             continue
         file_path = os.path.join(DATA_DIR, pdf["filepath"])
         try:
-            loader = PyPDFLoader(file_path)
-            docs = loader.load()
-            chunks = splitter.split_documents(docs)
+            chunks = await asyncio.to_thread(_load_chunks, file_path)
             for c in chunks:
                 c.metadata = {"user_id": user_id, "filename": pdf["filename"], "source": pdf["filename"], "is_public": pdf["is_public"]}
-            insert_new_chunks(chunks)
-            ingest(pdf["filename"], user_id, pdf["is_public"])
+            await insert_new_chunks(conn, chunks)
+            await ingest(pdf["filename"], user_id, pdf["is_public"])
             print(f"User {user_id} ingested PDF: {pdf['filename']}")
         except Exception as e:
             print(f"Failed to ingest {pdf['filename']}: {e}")
 
-def ingest_one_pdf_user(filename: str, user_id: str = None):
+async def ingest_one_pdf_user(conn: asyncpg.Connection, filename: str, user_id: str = None):
     """User: Ingest one PDF, but can only ingest PDFs which user uploaded."""
     if not user_id:
         print("user_id required")
         return
-    user_pdfs = get_pdfs_by_user(user_id)
+    user_pdfs = await get_pdfs_by_user(user_id)
     pdf_info = None
     for pdf in user_pdfs:
         if pdf["filename"] == filename:
@@ -193,17 +191,23 @@ def ingest_one_pdf_user(filename: str, user_id: str = None):
         return
     file_path = os.path.join(DATA_DIR, pdf_info["filepath"])
     try:
-        loader = PyPDFLoader(file_path)
-        docs = loader.load()
-        chunks = splitter.split_documents(docs)
+        chunks = await asyncio.to_thread(_load_chunks, file_path)
         for c in chunks:
             c.metadata = {"user_id": user_id, "filename": pdf_info["filename"], "source": pdf_info["filename"], "is_public": pdf_info["is_public"]}
-        insert_new_chunks(chunks)
-        ingest(pdf_info["filename"], user_id, pdf_info["is_public"])
+        await insert_new_chunks(conn, chunks)
+        await ingest(pdf_info["filename"], user_id, pdf_info["is_public"])
         print(f"User {user_id} ingested PDF: {filename}")
     except Exception as e:
         print(f"Failed to ingest {filename}: {e}")
 
+async def _main():
+    try:
+        async with (await get_pool()).acquire() as conn:
+            await ingest_all_pdfs(conn)
+    finally:
+        await close_pool()
+        await close_db()
+
 if __name__ == "__main__":
     print("Ingest all public PDFs (admin)")
-    ingest_all_pdfs()
\ No newline at end of file
+    asyncio.run(_main())
\ No newline at end of file